@@ -13,6 +13,7 @@ TESTS_PATH = "./tests"
 def tests(session: nox.Session):
     session.install(".[test]")
 
-    session.run("pytest", env={"PYTHONPATH": ""})
+    # The tests do not share any process state, so they are run in parallel
+    session.run("pytest", "-n", "auto", env={"PYTHONPATH": ""})
     # session.run("coverage", "run", "-p", "-m", "pytest", TESTS_PATH, env={'PYTHONPATH': ''})
     # session.run("coverage", "run", "-m", "pytest", TESTS_PATH, env={'PYTHONPATH': ''})
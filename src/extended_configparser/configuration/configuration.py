@@ -1,10 +1,18 @@
 from __future__ import annotations
 
 import io
+import locale
 import logging
 import os
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from configparser import Interpolation
 from configparser import SectionProxy
+from contextlib import contextmanager
+from typing import Any
+from typing import Callable
+from typing import Iterable
+from typing import Iterator
 
 from extended_configparser.configuration.entries import ConfigEntry
 from extended_configparser.configuration.entries import ConfigEntryCollection
@@ -13,6 +21,9 @@ from extended_configparser.parser import ExtendedConfigParser
 
 logger = logging.getLogger(__name__)
 
+_DEFAULT_ENV_INTERPOLATION = EnvInterpolation()
+"""Shared default interpolation, EnvInterpolation keeps no per-parser state."""
+
 
 class Configuration:
     """
@@ -23,10 +34,33 @@ class Configuration:
     With `inqure()` the user will be asked to provide the values for the defined entries.
     """
 
+    __slots__ = (
+        "config_path",
+        "auto_save",
+        "base_paths",
+        "_entries",
+        "_entry_refreshers",
+        "_config_parser",
+        "_own_parser",
+        "_parser_dirty",
+        "_batch_depth",
+        "_pending_save",
+        "_last_write",
+    )
+
+    READ_BUFFER_SIZE = 1 << 16
+    """Buffer size used when streaming large configuration files, smaller files are read at once anyway."""
+
+    SLURP_SIZE_LIMIT = 4 * 1024 * 1024
+    """Files smaller than this are read at once and parsed from memory instead of being streamed line by line."""
+
+    PARALLEL_READ_THRESHOLD = 3
+    """Minimum number of base configuration files (or files passed to `read()`), from which the files are fetched concurrently."""
+
     def __init__(
         self,
         path: str | None,
-        interpolation: Interpolation = EnvInterpolation(),
+        interpolation: Interpolation | None = None,
         base_paths: list[str] | None = None,
         auto_save: bool = False,
     ) -> None:
@@ -38,8 +72,8 @@ class Configuration:
             File path to the configuration file.
             You can leave the path to None if the config is mainly used to read values and you provide base_paths to read from.
             In this case, the write method needs a save_path to write the configuration.
-        interpolation : Interpolation, optional
-            Interpolation to use for the configuration file, by default EnvInterpolation()
+        interpolation : Interpolation | None, optional
+            Interpolation to use for the configuration file, by default a shared EnvInterpolation instance
         base_paths : list[str] | None, optional
             If the values of the configuration using interpolation reference other configuration files, those file paths can be specified here.
         auto_save : bool, optional
@@ -55,57 +89,138 @@ class Configuration:
         self.base_paths = base_paths or []
         """Paths to other configuration files that are automatically read."""
 
-        self._entries: list[ConfigEntry] = []
-        """Cache for the entries of the configuration."""
+        self._entries: tuple[ConfigEntry[Any], ...] | None = None
+        """Cache for the entries of the configuration, None if not collected yet."""
+
+        self._entry_refreshers: dict[str, list[tuple[ConfigEntry[Any], str, Callable[[Any, Any], None]]]] | None = None
+        """Cached `(entry, option key, value setter)` tuples grouped by section, None if not bound yet."""
+
+        if interpolation is None:
+            interpolation = _DEFAULT_ENV_INTERPOLATION
 
         self._config_parser = ExtendedConfigParser(interpolation=interpolation)
         """ConfigParser object used to read and write the configuration file."""
 
+        self._own_parser: ExtendedConfigParser | None = None
+        """ConfigParser holding only the content of the own configuration file, reused between writes."""
+
+        self._parser_dirty = False
+        """True if files were read into the config parser since the entries were last updated."""
+
+        self._batch_depth = 0
+        """Nesting depth of `batched_writes()` contexts, auto saves are deferred while greater than 0."""
+
+        self._pending_save = False
+        """True if an auto save was deferred by `batched_writes()`."""
+
+        self._last_write: tuple[str, bytes] | None = None
+        """Path and content of the file written last, to detect changes of the own config file by others."""
+
         self._update_entries()
 
     @staticmethod
-    def get_config_entries_in_object(cfg: Configuration, ignore: list[str] = ["entries"]) -> list[ConfigEntry]:
+    def _get_attributes(obj: object) -> Iterator[tuple[str, Any]]:
+        """
+        Yield the `(name, value)` pairs of the attributes of the given object.
+        Covers both the instance __dict__ and the __slots__ declared by subclasses, the internal slots of Configuration are skipped.
+        """
+        for klass in type(obj).__mro__:
+            if klass is Configuration:
+                break
+            slots = klass.__dict__.get("__slots__", ())
+            for slot in (slots,) if isinstance(slots, str) else slots:
+                if slot != "__dict__" and hasattr(obj, slot):
+                    yield slot, getattr(obj, slot)
+
+        if hasattr(obj, "__dict__"):
+            yield from obj.__dict__.items()
+
+    @staticmethod
+    def get_config_entries_in_object(
+        cfg: Configuration, ignore: Iterable[str] = ("entries",)
+    ) -> list[ConfigEntry[Any]]:
         """
         Get all ConfigEntries in the given object.
         Members in the ignore list will be skipped.
         """
-        entries: list[ConfigEntry] = []
-        for attr in cfg.__dict__:
-            if attr in ignore:
-                continue
-
-            if isinstance(getattr(cfg, attr), ConfigEntry):
-                entries.append(getattr(cfg, attr))
-            elif isinstance(getattr(cfg, attr), ConfigEntryCollection):
-                entries.extend(Configuration.get_config_entries_in_object(getattr(cfg, attr)))
+        ignored = frozenset(ignore)
+        entries: list[ConfigEntry[Any]] = []
+        entry_type, collection_type = ConfigEntry, ConfigEntryCollection
+        entry_types = (ConfigEntry, ConfigEntryCollection)
+        get_attributes = Configuration._get_attributes
+
+        # Walk nested collections with an explicit stack of attribute iterators, keeping the depth-first order
+        stack = [get_attributes(cfg)]
+        while stack:
+            for attr, value in stack[-1]:
+                if attr in ignored or not isinstance(value, entry_types):
+                    continue
+
+                if type(value) is entry_type or not isinstance(value, collection_type):
+                    entries.append(value)
+                else:
+                    stack.append(get_attributes(value))
+                    break
+            else:
+                stack.pop()
 
         return entries
 
     @property
-    def entries(self) -> list[ConfigEntry]:
+    def entries(self) -> tuple[ConfigEntry[Any], ...]:
         """
         Get all ConfigEntries in the configuration object.
         Based on the defined ConfigEntrie or ConfigEntryCollection members of the object.
+        The entries are returned as a tuple, as they are collected once and then only iterated.
         """
 
-        if len(self._entries) == 0:
-            # Iter over each attribute of the object and check if it is a ConfigEntry or a subclass of it
-            self._entries = Configuration.get_config_entries_in_object(self)
+        if self._entries is not None:
+            return self._entries
+
+        # Every instance is walked on its own, as instances of the same class can define different entries
+        entries = tuple(Configuration.get_config_entries_in_object(self))
 
-        return self._entries
+        # Entries might not be defined yet (e.g. when called from super().__init__), so only cache a found layout
+        if len(entries) > 0:
+            self._entries = entries
 
-    def _update_entries(self):
+        return entries
+
+    def _update_entries(self) -> None:
         """Update the entries based on the current read configurations."""
 
+        if self._entry_refreshers is None:
+            entries = self.entries
+            if len(entries) == 0:
+                return
+
+            # The parser and configuration references never change, so bind them only once
+            for entry in entries:
+                entry.configparser = self._config_parser
+                entry.configuration = self
+
+            self._entry_refreshers = defaultdict(list)
+            for entry in entries:
+                key = self._config_parser.optionxform(entry.option)
+                # Setter of the value property, also respecting properties overridden by subclasses
+                value_property: property = getattr(type(entry), "value")
+                self._entry_refreshers[entry.section].append((entry, key, value_property.__set__))
+
+        elif not self._parser_dirty:
+            # Nothing was read since the last update, so the entries are up to date
+            return
+
         auto_save = self.auto_save
         self.auto_save = False
 
-        for entry in self.entries:
-            entry.configparser = self._config_parser
-            entry.configuration = self
-            entry.value = entry.raw_value
+        # Look up the raw values directly in the section dicts instead of copying every section with items()
+        get_raw = self._config_parser.get_raw
+        for section, refreshers in self._entry_refreshers.items():
+            for entry, key, set_value in refreshers:
+                set_value(entry, get_raw(section, key))
 
         self.auto_save = auto_save
+        self._parser_dirty = False
 
     def load(self, inquire_if_missing: bool = False, quiet: bool = False) -> None:
         """Load the configuration file and set the values of the entries.
@@ -119,29 +234,104 @@ class Configuration:
             If True, no warning will be printed if the configuration file is missing.
         """
 
-        for base_path in self.base_paths:
-            if not os.path.exists(base_path):
-                if not quiet:
+        # The own configuration file might have changed on disk
+        self._own_parser = None
+
+        paths = self.base_paths + ([self.config_path] if self.config_path is not None else [])
+        # Only the base paths count, a couple of base files next to the own config file are still read serially
+        paths_ok = set(self._read_files(paths, concurrent=len(self.base_paths) >= self.PARALLEL_READ_THRESHOLD))
+
+        if not quiet:
+            for base_path in self.base_paths:
+                if base_path not in paths_ok:
                     logger.warning(f"Base configuration file {base_path} not found.")
-                continue
 
-            self._config_parser.read(base_path)
+        if self.config_path is not None and self.config_path not in paths_ok:
+            if not quiet:
+                logger.warning(f"Configuration file {self.config_path} not found.")
+            if inquire_if_missing:
+                self.inquire()
+
+        self._update_entries()
+
+    def _fetch_file(self, path: str) -> bytes | OSError | None:
+        """Fetch the content of a configuration file without parsing it.
 
-        if self.config_path is not None:
-            if not os.path.exists(self.config_path):
-                if not quiet:
-                    logger.warning(f"Configuration file {self.config_path} not found.")
-                if inquire_if_missing:
-                    self.inquire()
+        Returns None if the file is too large to be read at once and the raised error if the file cannot be read.
+        """
+        try:
+            with open(path, "rb", buffering=self.READ_BUFFER_SIZE) as f:
+                if os.fstat(f.fileno()).st_size < self.SLURP_SIZE_LIMIT:
+                    return f.read()
+        except OSError as e:
+            return e
+        return None
+
+    def _read_file(self, path: str, content: bytes | None = None, encoding: str | None = None) -> None:
+        """Read a single configuration file into the config parser.
+
+        Small files are read at once and parsed from memory, larger files are streamed using a large read buffer.
+        If the content of the file was already fetched, it is parsed directly.
+        Like ConfigParser.read, the file is decoded with the locale encoding if no encoding is given.
+        """
+        if content is not None:
+            self._parser_dirty = True
+            self._config_parser.read_string(content.decode(encoding or locale.getpreferredencoding(False)), source=path)
+            return
+
+        with open(path, "rb", buffering=self.READ_BUFFER_SIZE) as f:
+            self._parser_dirty = True
+            if os.fstat(f.fileno()).st_size < self.SLURP_SIZE_LIMIT:
+                data = f.read().decode(encoding or locale.getpreferredencoding(False))
+                self._config_parser.read_string(data, source=path)
             else:
-                self._config_parser.read(self.config_path)
+                self._config_parser.read_file(io.TextIOWrapper(f, encoding=encoding), source=path)
 
-        self._update_entries()
+    def _read_files(self, paths: list[str], encoding: str | None = None, concurrent: bool = False) -> list[str]:
+        """Read the given configuration files in order and return the paths that could be read.
+
+        If concurrent is True, the contents are fetched concurrently to overlap the I/O latency of slow
+        (e.g. network mounted) storage. Parsing always happens in the given order.
+        """
+        contents: list[bytes | OSError | None]
+        if concurrent:
+            with ThreadPoolExecutor(max_workers=min(8, len(paths))) as executor:
+                contents = list(executor.map(self._fetch_file, paths))
+        else:
+            contents = [None] * len(paths)
+
+        paths_ok = []
+        for path, content in zip(paths, contents):
+            if isinstance(content, OSError):
+                continue
+            try:
+                self._read_file(path, content, encoding)
+            except OSError:
+                continue
+            paths_ok.append(path)
+
+        return paths_ok
+
+    def read(
+        self,
+        path: str | bytes | os.PathLike[str] | Iterable[str | bytes | os.PathLike[str]],
+        encoding: str | None = None,
+    ) -> list[str]:
+        """Read the configuration from the file path.
+
+        Like ConfigParser.read, a single path or an iterable of paths is accepted and the paths that could be read
+        are returned as strings (or bytes for bytes paths). The files are decoded with the locale encoding
+        if no encoding is given.
+        """
 
-    def read(self, path: str | list[str]) -> list[str]:
-        """Read the configuration from the file path."""
+        # The own configuration file might have changed on disk
+        self._own_parser = None
 
-        paths_ok = self._config_parser.read(path)
+        paths = [path] if isinstance(path, (str, bytes, os.PathLike)) else path
+        fspaths = [os.fspath(p) for p in paths]
+        paths_ok = self._read_files(
+            fspaths, encoding, concurrent=len(fspaths) >= self.PARALLEL_READ_THRESHOLD  # type: ignore[arg-type]
+        )
         self._update_entries()
         return paths_ok
 
@@ -158,28 +348,103 @@ class Configuration:
                 raise ValueError("No save path provided and no default path set.")
             save_path = self.config_path
 
-        # Check if the directory exists
-        if not os.path.exists(os.path.dirname(save_path)):
-            os.makedirs(os.path.dirname(save_path))
+        # Existing content is decoded and the output encoded with the locale encoding, like load and read decode files
+        encoding = locale.getpreferredencoding(False)
 
         # We cannot just write the config file, as there could be base configs, whose content should not appear in this config.
-        parser = ExtendedConfigParser()
-        if os.path.exists(save_path):
-            parser.read(save_path)
+        try:
+            with open(save_path, "rb") as src:
+                existing: bytes | None = src.read()
+        except FileNotFoundError:
+            existing = None
+
+        # The parser of the own config file is kept, as long as the file still holds exactly what was written last.
+        # Otherwise the file was changed by someone else and is parsed again, so these changes are not overwritten.
+        last_write = self._last_write
+        if (
+            save_path == self.config_path
+            and self._own_parser is not None
+            and last_write is not None
+            and last_write[0] == save_path
+            and existing == last_write[1]
+        ):
+            parser = self._own_parser
+        else:
+            parser = ExtendedConfigParser()
+            if existing is not None:
+                parser.read_string(existing.decode(encoding), save_path)
+            if save_path == self.config_path:
+                self._own_parser = parser
+
+        # Values go through parser.set, so they are validated by the interpolation like any other value.
+        # Unset entries are removed, their sections are only added once they get a value.
         for entry in self.entries:
-            parser.set(entry.section, entry.option, entry.raw_value, entry.get_comment())
-
-        with io.open(save_path, "w") as f:
-            parser.write(f)
+            section, option, raw_value, comment = entry.as_tuple()
+            if raw_value is not None:
+                parser.set(section, option, raw_value, comment)
+            elif parser.has_section(section):
+                parser.remove_option(section, option)
+
+        # Serialize in memory first, so the file is written with a single call
+        data = str(parser).encode(encoding)
+
+        try:
+            dst = open(save_path, "wb")
+        except FileNotFoundError:
+            # Create the directory only if it does not exist yet
+            dirname = os.path.dirname(save_path)
+            if not dirname:
+                raise
+            os.makedirs(dirname, exist_ok=True)
+            dst = open(save_path, "wb")
+
+        with dst:
+            dst.write(data)
+
+        self._last_write = (save_path, data)
+
+    def save_if_auto(self) -> None:
+        """Save the configuration if auto_save is enabled. Called by the entries after their value was set.
+
+        Within `batched_writes()` the save is deferred until the end of the batch.
+        """
+        if not self.auto_save:
+            return
+
+        if self._batch_depth > 0:
+            self._pending_save = True
+        else:
+            self.write()
+
+    @contextmanager
+    def batched_writes(self) -> Iterator[None]:
+        """Context manager deferring the automatic saves of all values set within it to a single write at the end.
+
+        Example
+        -------
+        >>> with config.batched_writes():
+        ...     config.a.value = "a"
+        ...     config.b.value = "b"
+        """
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self._pending_save:
+                self._pending_save = False
+                self.write()
 
     def inquire(self, use_existing_values: bool = True) -> None:
         """Inquire the user for the values of the entries."""
 
         logger.debug(f"Inquire configuration @ {self.config_path}")
         self.load(quiet=True)
-        for entry in self.entries:
-            entry.inquire(use_existing_values)
-            # self._set_entry(entry)
+
+        # Save once after all entries are inquired instead of after every single entry
+        with self.batched_writes():
+            for entry in self.entries:
+                entry.inquire(use_existing_values)
 
         logger.debug(f"Configuration of {self.config_path} completed.")
 
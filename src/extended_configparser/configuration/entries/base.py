@@ -1,13 +1,18 @@
 from __future__ import annotations
 
+import configparser
 import logging
-import re
+import sys
+from pathlib import Path
+from types import ModuleType
 from typing import TYPE_CHECKING
 from typing import Any
 from typing import Callable
 from typing import Generic
 from typing import TypeVar
 
+from extended_configparser.interpolator import EnvInterpolation
+
 if TYPE_CHECKING:
     from extended_configparser import ExtendedConfigParser
     from extended_configparser.configuration.configuration import Configuration
@@ -22,6 +27,26 @@ InquireCondition = bool | Callable[[], bool]
 
 T = TypeVar("T")
 
+_MARKER_INTERPOLATIONS = (
+    configparser.Interpolation,
+    configparser.BasicInterpolation,
+    configparser.ExtendedInterpolation,
+    EnvInterpolation,
+)
+"""Interpolations that leave values without a '$' or '%' unchanged, so they can be skipped for such values."""
+
+_inquirer: ModuleType | None = None
+
+
+def get_inquirer() -> ModuleType:
+    """Return the `InquirerPy.inquirer` module, imported once on first use to keep the import of this package light."""
+    global _inquirer
+    if _inquirer is None:
+        from InquirerPy import inquirer
+
+        _inquirer = inquirer
+    return _inquirer
+
 
 class ConfigEntryCollection:
     """
@@ -31,7 +56,7 @@ class ConfigEntryCollection:
     inherit from this class and define your entries as attributes of type ConfigEntry or ConfigEntryCollection.
     """
 
-    pass
+    __slots__ = ()
 
 
 class ConfigEntry(Generic[T]):
@@ -39,6 +64,29 @@ class ConfigEntry(Generic[T]):
     Represents a single configuration entry.
     """
 
+    __slots__ = (
+        "section",
+        "option",
+        "default",
+        "message",
+        "_prompt",
+        "configuration",
+        "configparser",
+        "inquirer_kwargs",
+        "_do_inquire",
+        "is_dir",
+        "_ensured_dirs",
+        "value_transformer",
+        "value_setter",
+        "_key",
+        "_key_parser",
+        "_comment",
+        "_cached_value",
+    )
+
+    _DEFAULT_INQUIRER_KWARGS = {"qmark": "?", "amark": ">"}
+    """Default kwargs passed to the inquirer prompt, overridden by the kwargs given to the entry"""
+
     def __init__(
         self,
         section: str,
@@ -87,6 +135,9 @@ class ConfigEntry(Generic[T]):
         self.message = message
         """Message to be asked when the entry is inquired"""
 
+        self._prompt = self.get_msg(message)
+        """Normalized prompt of the message shown when inquiring the entry"""
+
         # self.required = required
 
         self.configuration: Configuration | None = None
@@ -95,7 +146,7 @@ class ConfigEntry(Generic[T]):
         self.configparser: ExtendedConfigParser | None = None
         """The ConfigParser instance to read and write the configuration"""
 
-        self.inquirer_kwargs = inquirer_kwargs
+        self.inquirer_kwargs = {**self._DEFAULT_INQUIRER_KWARGS, **inquirer_kwargs}
         """Additional kwargs to be passed to the inquirer prompt"""
 
         self._do_inquire = inquire
@@ -104,17 +155,26 @@ class ConfigEntry(Generic[T]):
         self.is_dir = is_dir
         """If the value is a dir. If True, the directory of the path will be created when fetching the value if it does not exist."""
 
+        self._ensured_dirs: dict[str, str] = {}
+        """Normalized paths of the directory values, which were already created or found to exist"""
+
         self.value_transformer = value_getter
         """A function to transform the string entry value to your desired type"""
 
         self.value_setter = value_setter
         """A function to transform your logical value to the config string"""
 
-        if "qmark" not in self.inquirer_kwargs:
-            self.inquirer_kwargs["qmark"] = "?"
+        self._key: str = self.option
+        """Option key as transformed by the optionxform of the configparser"""
+
+        self._key_parser: ExtendedConfigParser | None = None
+        """The configparser the cached option key was transformed with"""
+
+        self._comment: str | None = None
+        """Cached comment of the entry, built from the message and instructions on first use"""
 
-        if "amark" not in self.inquirer_kwargs:
-            self.inquirer_kwargs["amark"] = ">"
+        self._cached_value: tuple[ExtendedConfigParser, int, T | None] | None = None
+        """Value returned by the value property, with the configparser and its generation it was computed for"""
 
     def __call__(self, fallback: T | None = None) -> T | None:
         """
@@ -142,7 +202,14 @@ class ConfigEntry(Generic[T]):
         if self.configparser is None:
             raise ValueError("ConfigParser is not set.")
 
-        return self.configparser.get(self.section, self.option, raw=True, fallback=fallback)
+        return self.configparser.get_raw(self.section, self._get_key(self.configparser), fallback)
+
+    def _get_key(self, parser: ExtendedConfigParser) -> str:
+        """Return the option key as transformed by the given configparser, cached per configparser."""
+        if self._key_parser is not parser:
+            self._key = parser.optionxform(self.option)
+            self._key_parser = parser
+        return self._key
 
     def get_value(self, fallback: T | None = None, use_default=True) -> T | None:
         """Get the value of the entry.
@@ -162,12 +229,14 @@ class ConfigEntry(Generic[T]):
         if self.configparser is None:
             raise ValueError("ConfigParser is not set.")
 
-        value = self.configparser.get(
-            self.section,
-            self.option,
-            fallback=self.default if fallback is None else None,
-            raw=False,
-        )
+        parser_fallback = self.default if fallback is None else None
+        value = self.configparser.get_raw(self.section, self._get_key(self.configparser), parser_fallback)
+
+        # Only run the interpolation if the value can contain references at all
+        if value is not None and (
+            type(self.configparser._interpolation) not in _MARKER_INTERPOLATIONS or "$" in value or "%" in value
+        ):
+            value = self.configparser.get(self.section, self.option, fallback=parser_fallback, raw=False)
 
         if value is None:
             if fallback is not None:
@@ -178,21 +247,24 @@ class ConfigEntry(Generic[T]):
 
             return None
 
+        v = value
         if self.is_dir:
-            from pathlib import Path
-
-            p = Path(value)
-
-            # TODO: Make this OS independent
-            if p.is_absolute() or any(value.startswith(b) for b in ("./", "../", "~/")):
-                if not p.exists():
+            # Directories are only ensured once per value, later reads skip the Path handling completely
+            ensured = self._ensured_dirs.get(value)
+            if ensured is not None:
+                v = ensured
+            else:
+                p = Path(value)
+
+                # TODO: Make this OS independent
+                if p.is_absolute() or value.startswith(("./", "../", "~/")):
+                    v = str(p)
                     try:
                         p.mkdir(parents=True, exist_ok=True)
+                        self._ensured_dirs[value] = v
                     except Exception as e:
                         logger.warning(f"Failed to create directory {p}: {e}")
 
-                v = str(p)
-
         v = self.value_transformer(v)
         return v
 
@@ -209,15 +281,17 @@ class ConfigEntry(Generic[T]):
             raise ValueError("ConfigParser is not set.")
 
         if value is None:
-            if self.configparser.has_option(self.section, self.option):
+            try:
                 self.configparser.remove_option(self.section, self.option)
+            except configparser.NoSectionError:
+                pass
             return
         else:
             v = self.value_setter(value)
             self.configparser.set(self.section, self.option, v, self.get_comment())
 
-        if self.configuration is not None and self.configuration.auto_save:
-            self.configuration.write()
+        if self.configuration is not None:
+            self.configuration.save_if_auto()
 
     @property
     def raw_value(self) -> str | None:
@@ -225,7 +299,19 @@ class ConfigEntry(Generic[T]):
 
     @property
     def value(self) -> T | None:
-        return self.get_value()
+        """The value of the entry, cached until any value of the configparser changes."""
+        parser = self.configparser
+        if parser is None:
+            # Raises the error for entries without configparser
+            return self.get_value()
+
+        cached = self._cached_value
+        if cached is not None and cached[0] is parser and cached[1] == parser._generation:
+            return cached[2]
+
+        value = self.get_value()
+        self._cached_value = (parser, parser._generation, value)
+        return value
 
     @value.setter
     def value(self, value: T | None) -> None:
@@ -239,13 +325,14 @@ class ConfigEntry(Generic[T]):
 
     @staticmethod
     def escape_whitespace(value: str) -> str:
-        return re.sub(r"/s", "_", value).strip("_")
+        # Interned, as the same section names are shared by many entries and used as parser keys
+        return sys.intern("_".join(value.split()).strip("_"))
 
     @staticmethod
     def get_msg(msg: str, strip: str = ":.", end: str = ":") -> str:
-        msg = msg.strip()
-        msg = msg.strip(strip) + end
-        return msg
+        msg = msg.strip().strip(strip)
+        # Avoid a doubled end if it is not among the stripped characters
+        return msg if msg.endswith(end) else msg + end
 
     def do_inquire(self) -> bool:
         if isinstance(self._do_inquire, bool):
@@ -267,22 +354,45 @@ class ConfigEntry(Generic[T]):
         if not self.do_inquire():
             return
 
-        from InquirerPy import inquirer
+        self.value = self.build_prompt(get_inquirer(), use_existing_as_default).execute()
+
+    def build_prompt(self, inquirer: ModuleType, use_existing_as_default: bool = True) -> Any:
+        """Create the prompt for inquiring this entry, without executing it.
+
+        Subclasses override this instead of inquire to use another kind of prompt.
+
+        Parameters
+        ----------
+        inquirer : ModuleType
+            The `InquirerPy.inquirer` module, as returned by get_inquirer
+        use_existing_as_default : bool, optional
+            If True, the existing value of a config is taken as default value when asking the user, otherwise take the given default value, by default True
 
+        Returns
+        -------
+        Any
+            The InquirerPy prompt, whose execute() returns the new value.
+        """
         default = ((self.raw_value or self.default) if use_existing_as_default else self.default) or ""
 
-        msg = self.get_msg(self.message)
-        self.value = inquirer.text(
-            message=msg,
+        return inquirer.text(
+            message=self._prompt,
             default=default,
             **self.inquirer_kwargs,
-        ).execute()
+        )
 
-    def get_comment(self) -> str:
-        s = self.message
-        if "instruction" in self.inquirer_kwargs:
-            s += f"\nInstruction: {self.inquirer_kwargs['instruction']}"
-        if "long_instruction" in self.inquirer_kwargs:
-            s += f"\nLong Instruction: {self.inquirer_kwargs['long_instruction']}"
+    def as_tuple(self) -> tuple[str, str, str | None, str]:
+        """Return the `(section, option, raw_value, comment)` tuple used to write this entry."""
+        return self.section, self.option, self.get_raw_value(), self.get_comment()
 
-        return s
+    def get_comment(self) -> str:
+        if self._comment is None:
+            s = self.message
+            kwargs = self.inquirer_kwargs
+            if "instruction" in kwargs:
+                s += f"\nInstruction: {kwargs['instruction']}"
+            if "long_instruction" in kwargs:
+                s += f"\nLong Instruction: {kwargs['long_instruction']}"
+            self._comment = s
+
+        return self._comment
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import logging
+from types import ModuleType
 from typing import Any
 
 from extended_configparser.configuration.entries.base import ConfigEntry
@@ -8,12 +9,17 @@ from extended_configparser.configuration.entries.base import InquireCondition
 
 logger = logging.getLogger(__name__)
 
+_TRUE_STRINGS = frozenset({"true", "yes", "1", "y", "on", "t"})
+"""Lower case strings that are considered True."""
+
 
 class ConfigConfirmationEntry(ConfigEntry[bool]):
     """
     Represents a single confirmation configuration entry (yes/no).
     """
 
+    __slots__ = ()
+
     def __init__(
         self,
         section: str,
@@ -49,20 +55,14 @@ class ConfigConfirmationEntry(ConfigEntry[bool]):
             **inquirer_kwargs,
         )
 
-    def inquire(self, use_existing_as_default: bool = True) -> None:
-        """Inquire the user for the value of this entry."""
-
-        if not self.do_inquire():
-            return
-
-        from InquirerPy import inquirer
-
-        msg = self.get_msg(self.message)
-        self.value = inquirer.confirm(
-            message=msg,
-            default=(self.to_bool(self.value) if use_existing_as_default else self.default),
+    def build_prompt(self, inquirer: ModuleType, use_existing_as_default: bool = True) -> Any:
+        """Create the confirm prompt for this entry."""
+        return inquirer.confirm(
+            message=self._prompt,
+            # The value is already transformed by to_bool, only the default is stored as string
+            default=(self.value if use_existing_as_default else self.to_bool(self.default)),
             **self.inquirer_kwargs,
-        ).execute()
+        )
 
     @staticmethod
     def to_bool(value: Any):
@@ -79,11 +79,7 @@ class ConfigConfirmationEntry(ConfigEntry[bool]):
                 return True
 
         if isinstance(value, str):
-            v = value.lower()
-            if v == "true" or v == "yes" or v == "1":
-                return True
-
-            return False
+            return value.strip().lower() in _TRUE_STRINGS
 
         try:
             return bool(value)
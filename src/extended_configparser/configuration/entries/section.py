@@ -23,6 +23,8 @@ class ConfigSection:
     Create entries by calling `section.ConfigSection("section_name")`.
     """
 
+    __slots__ = ("name",)
+
     def __init__(self, name: str) -> None:
         self.name = name
 
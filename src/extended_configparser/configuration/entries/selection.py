@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import logging
+from types import ModuleType
 from typing import TYPE_CHECKING
 from typing import Any
 
@@ -9,12 +10,29 @@ from extended_configparser.configuration.entries.base import InquireCondition
 
 logger = logging.getLogger(__name__)
 
+_choice_type: type | None = None
+
+
+def _get_choice_type() -> type:
+    """Return the `InquirerPy.base.Choice` class, imported once on first use like the inquirer itself."""
+    global _choice_type
+    if _choice_type is None:
+        from InquirerPy.base import Choice
+
+        _choice_type = Choice
+    return _choice_type
+
 
 class ConfigSelectionEntry(ConfigEntry[str]):
     """
     Represents a selection configuration entry with a list of selectable options.
     """
 
+    __slots__ = ("choices", "multiselect", "delimiter", "_select_kwargs")
+
+    _DEFAULT_SELECT_KWARGS = {"long_instruction": "Use <tab> to de/select values and <enter> to confirm."}
+    """Default kwargs passed to the select prompt, overridden by the kwargs given to the entry"""
+
     def __init__(
         self,
         section: str,
@@ -61,36 +79,36 @@ class ConfigSelectionEntry(ConfigEntry[str]):
         self.multiselect = multiselect
         self.delimiter = delimiter
 
-    def inquire(self, use_existing_as_default: bool = True) -> None:
-        """Inquire the user for the value of this entry."""
-
-        if not self.do_inquire:
-            return
-
-        from InquirerPy import inquirer
-        from InquirerPy.base import Choice
+        # Merged once here instead of copying the kwargs on every prompt.
+        # Kept apart from inquirer_kwargs, as these are also written as comment of the entry.
+        self._select_kwargs = {**self._DEFAULT_SELECT_KWARGS, **self.inquirer_kwargs}
 
-        msg = self.get_msg(self.message)
-        values = set(self.value)
-        choices = [Choice(i, enabled=i in values) for i in self.choices]
+    def build_prompt(self, inquirer: ModuleType, use_existing_as_default: bool = True) -> Any:
+        """Create the select prompt for this entry."""
+        Choice = _get_choice_type()
 
-        kwargs = self.inquirer_kwargs.copy()
-        if "long_instruction" not in kwargs:
-            kwargs["long_instruction"] = "Use <tab> to de/select values and <enter> to confirm."
+        if self.multiselect:
+            # The set of current values is built once, so each choice is checked in constant time
+            values = frozenset(self.value)
+            choices = [Choice(i, enabled=i in values) for i in self.choices]
+        else:
+            # Pre-selection only has an effect for multiselect prompts, so the value is not needed at all
+            choices = [Choice(i) for i in self.choices]
 
-        result = inquirer.select(
-            message=msg,
+        return inquirer.select(
+            message=self._prompt,
             choices=choices,
             multiselect=self.multiselect,
             default=None,
-            **self.inquirer_kwargs,
-        ).execute()
-
-        self.value = result
+            **self._select_kwargs,
+        )
 
     @staticmethod
-    def list_to_string(values: list[str], delimiter: str = ", ") -> str:
-        """Transform values to a list."""
+    def list_to_string(values: list[str] | str | None, delimiter: str = ", ") -> str | None:
+        """Transform a list to a string, values that already are strings are returned unchanged."""
+        # Raw values from the configparser are set as strings, which must not be joined character by character
+        if values is None or isinstance(values, str):
+            return values
         return delimiter.join(values)
 
     @staticmethod
@@ -98,7 +116,7 @@ class ConfigSelectionEntry(ConfigEntry[str]):
         """Transform a string to a list."""
         if value is None or value == "":
             return []
-        return [v.strip() for v in value.split(delimiter)]
+        return list(map(str.strip, value.split(delimiter)))
 
     @property
     def value(self) -> list[str]:
@@ -3,6 +3,10 @@ from __future__ import annotations
 import configparser
 import os
 import re
+from collections import ChainMap
+
+_MISSING = object()
+"""Sentinel for options that do not exist."""
 
 
 class EnvInterpolation(configparser.ExtendedInterpolation):
@@ -12,6 +16,10 @@ class EnvInterpolation(configparser.ExtendedInterpolation):
 
     To interpolate environment variables in values, use the following syntax:
     value = ${ENV_VAR_NAME}
+
+    When used with an ExtendedConfigParser, interpolated values are cached by the parser until
+    one of its values is set or removed or another file is read. Environment variables are thus
+    resolved when a value is interpolated for the first time.
     """
 
     ENV_PATTERN = re.compile(r"\$\[([^\}]+)\]")
@@ -20,13 +28,38 @@ class EnvInterpolation(configparser.ExtendedInterpolation):
     def __init__(self, allow_uninterpolated_values: bool = False) -> None:
         self.allow_uninterpolated_values = allow_uninterpolated_values
 
+    def before_get(self, parser, section, option, value, defaults):  # type: ignore
+        cache = getattr(parser, "_interpolation_cache", None)
+        # Only plain gets are cached: `vars` passed to get() or items() would change the result
+        if cache is None or not isinstance(defaults, ChainMap) or defaults.maps[0]:
+            return super().before_get(parser, section, option, value, defaults)
+
+        key = (section, option, value)
+        try:
+            return cache[key]
+        except KeyError:
+            pass
+
+        result = cache[key] = super().before_get(parser, section, option, value, defaults)
+        return result
+
     def _interpolate_some(self, parser, option, accum, rest, section, map, depth) -> None:  # type: ignore
         rawval = parser.get(section, option, raw=True, fallback=rest)
 
         if depth > configparser.MAX_INTERPOLATION_DEPTH:
             raise configparser.InterpolationDepthError(option, section, rawval)
+
+        # Values without any reference are by far the most common ones
+        if "$" not in rest:
+            accum.append(rest)
+            return
+
+        # Expand $VAR style references once, the remainder of the loop only consumes the expanded string
+        rest = os.path.expandvars(rest)
+        # Local aliases for the lookups done for every reference in the loop
+        key_match = self._KEYCRE.match
+        optionxform = parser.optionxform
         while rest:
-            rest = os.path.expandvars(rest)
             p = rest.find("$")
             if p < 0:
                 accum.append(rest)
@@ -42,7 +75,7 @@ class EnvInterpolation(configparser.ExtendedInterpolation):
                 accum.append("$")
                 rest = rest[2:]
             elif c == "{":
-                m = self._KEYCRE.match(rest)
+                m = key_match(rest)
                 if m is None:
                     raise configparser.InterpolationSyntaxError(
                         option,
@@ -59,16 +92,19 @@ class EnvInterpolation(configparser.ExtendedInterpolation):
                         if path[0] in os.environ:
                             v = os.environ[path[0]]
                         else:
-                            opt = parser.optionxform(path[0])
+                            opt = optionxform(path[0])
                             v = map[opt]
                     elif len(path) == 2:
                         sect = path[0]
-                        opt = parser.optionxform(path[1])
+                        opt = optionxform(path[1])
                         if self.allow_uninterpolated_values:
-                            if not parser.has_option(sect, opt):
-                                accum.append("$" + c + ":".join(path))
+                            # Single lookup with a sentinel instead of has_option followed by get
+                            v = parser.get(sect, opt, raw=True, fallback=_MISSING)
+                            if v is _MISSING:
+                                accum.append("$" + c + ":".join(path) + "}")
                                 continue
-                        v = parser.get(sect, opt, raw=True)
+                        else:
+                            v = parser.get(sect, opt, raw=True)
                     else:
                         raise configparser.InterpolationSyntaxError(
                             option, section, "More than one ':' found: %r" % (rest,)
@@ -88,7 +124,8 @@ class EnvInterpolation(configparser.ExtendedInterpolation):
                         accum,
                         v,
                         sect,
-                        dict(parser.items(sect, raw=True)),
+                        # Chained view of the section and the defaults instead of a copy of all its items
+                        parser._unify_values(sect, None),
                         depth + 1,
                     )
                 else:
@@ -1,46 +1,110 @@
 from __future__ import annotations
 
+import functools
+import io
+import itertools
 import logging
 import re
 from collections.abc import Iterable
 from collections.abc import Iterator
+from collections.abc import Sequence
 
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=None)
+def _compile_patterns(
+    delimiters: tuple[str, ...], comment_prefixes: tuple[str, ...]
+) -> tuple[re.Pattern[str], re.Pattern[str], re.Pattern[str], re.Pattern[str], re.Pattern[str]]:
+    """Compile the comment, section, option, comment prefix and combined line patterns of a config syntax."""
+    r_delimiters = "|".join(re.escape(d) for d in delimiters)
+    r_comment_prefixes = "".join(re.escape(p) for p in comment_prefixes)
+
+    comment_re = re.compile(rf"^\s*([{r_comment_prefixes}])\s*(.+?)$")
+    section_re = re.compile(rf"^\s*\[([^\]]+)\]\s*$")
+    option_re = re.compile(rf"^\s*(\b.+?\b)\s*?({r_delimiters})")
+
+    # Matches the comment prefix at the start of a line. Longer prefixes are tried first,
+    # so overlapping prefixes like "#" and "##" remove the whole prefix, independent of their order.
+    sorted_prefixes = sorted(comment_prefixes, key=len, reverse=True)
+    comment_prefix_re = re.compile("|".join(re.escape(p) for p in sorted_prefixes))
+
+    # All kinds of lines in one pattern, so get_matches classifies each line with a single match.
+    # The alternatives keep the priority of the single checks, each has exactly one named group.
+    line_re = re.compile(
+        rf"^\s*(?:(?P<empty>$)"
+        rf"|(?P<comment>[{r_comment_prefixes}])\s*.+?$"
+        rf"|\[(?P<section>[^\]]+)\]\s*$"
+        rf"|(?P<option>\b.+?\b)\s*?(?:{r_delimiters}))"
+    )
+
+    return comment_re, section_re, option_re, comment_prefix_re, line_re
+
+
 class ConfigMatcher:
     """
     A class that can match comments, sections and options in a configuration file.
     The matcher depends on the delimiter and comment prefixe definition used in the configuration file.
     """
 
-    def __init__(self, delimiters: list[str], comment_prefixes: list[str]):
+    def __init__(self, delimiters: Sequence[str], comment_prefixes: Sequence[str]):
         """Initialize the config matcher.
 
         Parameters
         ----------
-        delimiters : list[str]
+        delimiters : Sequence[str]
             Delimiters used in the configuration file to separate options from values.
-        comment_prefixes : list[str]
+        comment_prefixes : Sequence[str]
             Symbols used to indicate a comment in the configuration file.
         """
         self.delimiters = delimiters
         self.comment_prefixes = comment_prefixes
 
-        r_delimiters = "|".join(re.escape(d) for d in self.delimiters)
-        r_comment_prefixes = "".join(re.escape(p) for p in self.comment_prefixes)
+        # Compiled once per syntax and shared by all matchers, instead of compiling the patterns for every matcher
+        (
+            self._comment_re,
+            self._section_re,
+            self._option_re,
+            self._comment_prefix_re,
+            self._line_re,
+        ) = _compile_patterns(tuple(delimiters), tuple(comment_prefixes))
+
+        self.comment_pattern = self._comment_re.pattern
+        self.section_pattern = self._section_re.pattern
+        self.option_pattern = self._option_re.pattern
+
+        # Characters the comment pattern accepts as prefix, checked on the first character of a line
+        self._comment_prefix_chars = frozenset("".join(self.comment_prefixes))
+
+        # Delimiters to find options with str.find. Only possible if neither the delimiters nor the comment prefixes
+        # contain word characters, otherwise the word boundaries of the pattern could decide differently.
+        # Delimiters with whitespace are matched by the pattern as well, as the fast path only sees stripped lines.
+        delimiter_chars = "".join(self.delimiters)
+        syntax_chars = delimiter_chars + "".join(self.comment_prefixes)
+        self._option_delimiters: tuple[str, ...] = ()
+        if not any(self._is_word_char(c) for c in syntax_chars) and not any(c.isspace() for c in delimiter_chars):
+            self._option_delimiters = tuple(d for d in self.delimiters if d)
+
+    @staticmethod
+    def get(delimiters: Sequence[str], comment_prefixes: Sequence[str]) -> ConfigMatcher:
+        """Return a matcher for the given delimiters and comment prefixes, shared by all callers of the same syntax.
 
-        self.comment_pattern = rf"^\s*([{r_comment_prefixes}])\s*(.+?)$"
-        self.section_pattern = rf"^\s*\[([^\]]+)\]\s*$"
-        self.option_pattern = rf"^\s*(\b.+?\b)\s*?({r_delimiters})"
+        Matchers keep no state between calls, thus the same instance can be used by any number of parsers.
+        The shared matcher keeps the delimiters and comment prefixes as tuples, so they cannot be changed by one user.
+        """
+        return _get_matcher(tuple(delimiters), tuple(comment_prefixes))
 
     def get_matches(self, text: str | Iterable[str]) -> Iterator[CommentMatch]:
         """Yield comment matches found in the given text."""
 
-        lines: list[str] | Iterable[str]
+        lines: Iterable[str]
 
-        if type(text) is str:
-            lines = text.split("\n")
+        if isinstance(text, str):
+            # Iterated lazily instead of splitting the whole text into a list. Like text.split("\n"), lines are only
+            # split at "\n" and a text ending with "\n" (or an empty text) ends with an empty line.
+            lines = io.StringIO(text, newline="\n")
+            if not text or text.endswith("\n"):
+                lines = itertools.chain(lines, ("",))
         else:
             lines = text
 
@@ -49,88 +113,201 @@ class ConfigMatcher:
         current_option = None
         current_comment_lines: list[str] = []
 
+        # The lines are classified one by one instead of running one pattern over the whole text, as files and
+        # other iterables are consumed lazily. Most lines are decided by string checks in classify without any pattern.
+        classify = self.classify
         for line in lines:
-            if self.is_empty(line):
-                if len(current_comment_lines) > 0 and not started:
+            kind, value = classify(line)
+
+            if kind == "empty":
+                # Before the first section or option, a comment followed by an empty line is the top comment
+                if current_comment_lines and not started:
                     started = True
-                    yield CommentMatch(self, "\n".join(current_comment_lines), current_section, current_option)
+                    yield CommentMatch(self, "\n".join(current_comment_lines), None, None)
 
                 current_comment_lines = []
                 continue
 
-            # Check this first, because comments can contain delimiters or other stuff
-            if self.is_comment(line):
-                current_comment_lines.append(line.strip())
+            # Comments take precedence, because they can contain delimiters or other stuff
+            if kind == "comment":
+                current_comment_lines.append(value)  # type: ignore[arg-type]
                 continue
 
             started = True
-            if (section := self.get_section(line)) is not None:
-                current_section = section
+            if kind == "section":
+                current_section = value
                 current_option = None
 
-                if len(current_comment_lines) > 0:
+                if current_comment_lines:
                     yield CommentMatch(self, "\n".join(current_comment_lines), current_section, None)
 
                 current_comment_lines = []
                 continue
 
-            if (option := self.get_option(line)) is not None:
-                current_option = option
+            if kind == "option":
+                current_option = value
 
-                if len(current_comment_lines) > 0:
+                if current_comment_lines:
                     yield CommentMatch(self, "\n".join(current_comment_lines), current_section, current_option)
 
                 current_comment_lines = []
                 continue
 
-        if len(current_comment_lines) > 0:
+        if current_comment_lines:
             yield CommentMatch(self, "\n".join(current_comment_lines), None, None)
 
+    def classify(self, line: str) -> tuple[str | None, str | None]:
+        """Classify a line of a configuration file, stripping it only once.
+
+        Returns the kind of the line, one of "empty", "comment", "section", "option" or None for other lines,
+        together with the stripped line for comments, the name for sections and options and None otherwise.
+        """
+        stripped = line.strip()
+        if not stripped:
+            return "empty", None
+
+        first = stripped[0]
+        if first in self._comment_prefix_chars and len(stripped) > 1:
+            return "comment", stripped
+
+        # Sections are recognized by their brackets, the same lines the pattern accepts as sections
+        if first == "[" and stripped[-1] == "]":
+            section = stripped[1:-1]
+            if section and "]" not in section:
+                return "section", section.strip()
+
+        option = self._find_option(stripped)
+        if option:
+            return "option", option
+
+        # Only lines the string checks cannot decide need the combined pattern
+        m = self._line_re.match(line)
+        if m is None:
+            return None, None
+        kind = m.lastgroup
+        if kind == "comment":
+            return kind, stripped
+        if kind in ("section", "option"):
+            return kind, m.group(kind).strip()
+        return kind, None
+
     @staticmethod
-    def clean_prefix(text: str, comment_prefixes: list[str], multiline: bool = True) -> str:
+    def clean_prefix(text: str, comment_prefixes: Sequence[str], multiline: bool = True) -> str:
         """Remove comment prefixes from a string."""
 
+        # Joined once per call, also working for tuples of prefixes, which cannot be concatenated with a list
+        prefix_chars = "".join(comment_prefixes)
+
         if multiline:
-            return "\n".join([line.lstrip("".join(comment_prefixes + [" "])) for line in text.split("\n")])
+            strip_chars = prefix_chars + " "
+            return "\n".join([line.lstrip(strip_chars) for line in text.split("\n")])
 
-        return text.lstrip("".join(comment_prefixes))
+        return text.lstrip(prefix_chars)
 
     @staticmethod
-    def add_prefix(text: str, prefix: str, multiline: bool = True, add_space: bool = True) -> str:
-        """Add a comment prefix to a string."""
+    def add_prefix(text: str, prefix: str, multiline: bool = True, add_space: bool = True, guard: bool = True) -> str:
+        """Add a comment prefix to a string.
+
+        If `guard` is True, lines already starting with the prefix are left unchanged.
+        """
 
         if add_space:
             prefix = prefix.strip() + " "
 
         if multiline:
+            if not guard:
+                return prefix + text.replace("\n", "\n" + prefix)
+
             # Add prefix only if the line does not start with a comment prefix
             return "\n".join([prefix + line if not line.startswith(prefix) else line for line in text.split("\n")])
 
+        if not guard:
+            return prefix + text
         return prefix + text if not text.startswith(prefix) else text
 
+    @staticmethod
+    def _is_word_char(c: str) -> bool:
+        """Return True if the character is matched by \\w of the re module."""
+        return c.isalnum() or c == "_"
+
+    def _find_option(self, stripped: str) -> str | None:
+        """Return the option name of a stripped line by searching the first delimiter.
+
+        Returns an empty string if the line is certainly no option line and None if this could not be decided
+        this way, the option pattern has to be matched in this case.
+        """
+        if not self._option_delimiters:
+            return None
+
+        # The name has to start with a word character
+        if not self._is_word_char(stripped[0]):
+            return ""
+
+        pos = -1
+        for delimiter in self._option_delimiters:
+            p = stripped.find(delimiter)
+            if p >= 0 and (pos < 0 or p < pos):
+                pos = p
+
+        if pos < 0:
+            return ""
+
+        # The pattern takes the shortest name ending with a word character before the delimiter,
+        # otherwise it would try the following delimiters
+        name = stripped[:pos].rstrip()
+        if not self._is_word_char(name[-1]) or "\n" in name:
+            return None
+        return name
+
     @staticmethod
     def is_empty(line: str) -> bool:
         return len(line.strip()) == 0
 
     def is_comment(self, line: str) -> bool:
         """Return True if the line is a comment."""
-        return bool(re.match(self.comment_pattern, line))
+        stripped = line.lstrip()
+        if not stripped or stripped[0] not in self._comment_prefix_chars:
+            return False
+
+        # A comment needs some text after the prefix on the same line, like the comment pattern demands
+        if "\n" in stripped:
+            return self._comment_re.match(line) is not None
+        return len(stripped) > 1
 
     def get_section(self, line: str) -> str | None:
         """Return the section name if the line is a section line, otherwise None."""
-        match = re.match(self.section_pattern, line)
-        if match:
-            return match.group(1).strip()
-        return None
+        # The brackets must enclose a non-empty name without closing brackets, as in the section pattern
+        stripped = line.strip()
+        if len(stripped) < 3 or stripped[0] != "[" or stripped[-1] != "]":
+            return None
+
+        section = stripped[1:-1]
+        if "]" in section:
+            return None
+        return section.strip()
 
     def get_option(self, line: str) -> str | None:
         """Return the option name if the line is an option line, otherwise None."""
-        match = re.match(self.option_pattern, line)
+        stripped = line.strip()
+        if not stripped:
+            return None
+
+        option = self._find_option(stripped)
+        if option is not None:
+            return option or None
+
+        match = self._option_re.match(line)
         if match:
             return match.group(1).strip()
         return None
 
 
+@functools.lru_cache(maxsize=32)
+def _get_matcher(delimiters: tuple[str, ...], comment_prefixes: tuple[str, ...]) -> ConfigMatcher:
+    """Create the shared matcher of a syntax, see ConfigMatcher.get."""
+    return ConfigMatcher(delimiters, comment_prefixes)
+
+
 class CommentMatch:
     def __init__(self, matcher: ConfigMatcher, raw_comment: str, section: str | None, option: str | None) -> None:
         self.matcher = matcher
@@ -140,10 +317,11 @@ class CommentMatch:
 
         # Clean up the comment string
         lines = self.raw_comment.split("\n")
+        match_prefix = matcher._comment_prefix_re.match
         for i, line in enumerate(lines):
-            for prefix in matcher.comment_prefixes:
-                if line.startswith(prefix):
-                    lines[i] = line[len(prefix) :].strip()
+            m = match_prefix(line)
+            if m is not None:
+                lines[i] = line[m.end() :].strip()
 
         self.comment: str = "\n".join(lines)
         """The comment string without comment prefixes."""
@@ -1,14 +1,20 @@
 from __future__ import annotations
 
 import configparser
+import io
 import logging
 import os
 from typing import Any
+from typing import Callable
 from typing import Iterable
+from typing import Iterator
+
+from extended_configparser.matcher import ConfigMatcher
 
 logger = logging.getLogger(__name__)
 
-from extended_configparser.matcher import ConfigMatcher
+_NO_COMMENTS: dict[str, str | None] = {}
+"""Shared empty comments of sections without option comments, never modified."""
 
 
 class ExtendedConfigParser(configparser.ConfigParser):
@@ -19,6 +25,12 @@ class ExtendedConfigParser(configparser.ConfigParser):
     or use it directly when setting values with set(section, option, value, comment).
     """
 
+    # Internals of ConfigParser used by this subclass, which are not part of the typeshed stubs
+    _sections: dict[str, dict[str, str | None]]
+    _defaults: dict[str, str | None]
+    _interpolation: configparser.Interpolation
+    _allow_no_value: bool
+
     def __init__(
         self,
         defaults=None,
@@ -38,6 +50,12 @@ class ExtendedConfigParser(configparser.ConfigParser):
         if defaults is None:
             defaults = {}
 
+        # Interpolated values by (section, option, raw value), filled by EnvInterpolation.
+        # Created before the parent init, as reading the defaults already calls set.
+        self._interpolation_cache: dict[tuple[str, str, str], str] = {}
+        # Incremented on every change of the values, so values derived from the parser can be cached
+        self._generation = 0
+
         super().__init__(
             defaults=defaults,
             dict_type=dict_type,
@@ -59,6 +77,8 @@ class ExtendedConfigParser(configparser.ConfigParser):
         self._delimiters = delimiters
         self._comment_prefixes = comment_prefixes
         self._ignore_non_existent_files = ignore_non_existent_files
+        # Shared by all parsers with the same delimiters and comment prefixes
+        self._matcher = ConfigMatcher.get(delimiters, comment_prefixes)
 
     #############################################################################
     ### INTERNAL AND OVERRIDE METHODS
@@ -82,14 +102,17 @@ class ExtendedConfigParser(configparser.ConfigParser):
         for filename in filenames:
             if os.path.exists(filename) and os.path.isfile(filename):
                 try:
+                    # read_file also parses the comments
                     with open(filename, encoding=encoding) as f:
                         self.read_file(f, filename)
-                        self._parse_comments(f.read())
                 except OSError:
                     continue
+                if isinstance(filename, os.PathLike):
+                    filename = os.fspath(filename)
                 paths_ok.append(filename)
             elif not self._ignore_non_existent_files:
                 logger.warning(f"File {filename} does not exist.")
+        return paths_ok
 
     def read_file(self, f, source=None) -> None:
         """Like read() but the argument must be a file-like object.
@@ -99,9 +122,27 @@ class ExtendedConfigParser(configparser.ConfigParser):
         file being read. If not given, it is taken from f.name. If `f` has no
         `name` attribute, `<???>` is used.
         """
-        super().read_file(f, source)
-        f.seek(0)
-        self._parse_comments(f)
+        self._invalidate()
+
+        seekable = getattr(f, "seekable", None)
+        if seekable is not None and seekable():
+            super().read_file(f, source)
+            f.seek(0)
+            self._parse_comments(f)
+            return
+
+        # Other iterables of lines can only be iterated once, so keep the lines for parsing the comments
+        if source is None:
+            source = getattr(f, "name", "<???>")
+        lines: list[str] = []
+
+        def record_lines() -> Iterator[str]:
+            for line in f:
+                lines.append(line)
+                yield line
+
+        super().read_file(record_lines(), source)
+        self._parse_comments(lines)
 
     def write(self, fp, space_around_delimiters=True) -> None:
         """Write an .ini-format representation of the configuration state.
@@ -112,51 +153,72 @@ class ExtendedConfigParser(configparser.ConfigParser):
         Please note that comments in the original configuration file are not
         preserved when writing the configuration back.
         """
+        fp.write(self._serialize(space_around_delimiters))
+
+    def _serialize(self, space_around_delimiters: bool = True) -> str:
+        """Return the .ini-format representation written by write()."""
+        # Assembled in memory, so the target gets a single write call instead of several per option
+        buffer = io.StringIO()
+
+        # Comments are stored without prefixes, so every line is prefixed without checking for existing ones.
+        # A comment line starting with a prefix itself thus keeps it, instead of losing it on the next read.
         if space_around_delimiters:
-            d = " {} ".format(self._delimiters[0])
+            d = f" {self._delimiters[0]} "
         else:
             d = self._delimiters[0]
 
         if self.top_comment:
-            fp.write(ConfigMatcher.add_prefix(self.top_comment, self._comment_prefixes[0]) + "\n\n")
+            buffer.write(ConfigMatcher.add_prefix(self.top_comment, self._comment_prefixes[0], guard=False) + "\n\n")
 
         if self._defaults:
-            self._write_section(fp, self.default_section, self._defaults.items(), d)
+            self._write_section(buffer, self.default_section, self._defaults.items(), d)
         for section in self._sections:
-            self._write_section(fp, section, self._sections[section].items(), d)
+            self._write_section(buffer, section, self._sections[section].items(), d)
 
         if self.end_comment:
-            fp.write(ConfigMatcher.add_prefix(self.end_comment, self._comment_prefixes[0]))
+            buffer.write(ConfigMatcher.add_prefix(self.end_comment, self._comment_prefixes[0], guard=False))
+
+        return buffer.getvalue()
 
-    def _write_section(self, fp, section_name: str, section_items: dict[str, str], delimiter: str) -> None:
+    def _write_section(
+        self, fp, section_name: str, section_items: Iterable[tuple[str, str | None]], delimiter: str
+    ) -> None:
         """Write a single section to the specified `fp`."""
-        if section_name in self._section_comments:
-            comment = self._section_comments[section_name]
-            if comment is not None:
-                fp.write(ConfigMatcher.add_prefix(comment, self._comment_prefixes[0]) + "\n")
+        prefix = self._comment_prefixes[0]
+        add_prefix = ConfigMatcher.add_prefix
+
+        comment = self._section_comments.get(section_name)
+        if comment is not None:
+            fp.write(add_prefix(comment, prefix, guard=False) + "\n")
+
+        # Looked up once per section instead of once per option
+        option_comments = self._option_comments.get(section_name, _NO_COMMENTS)
+
+        # The stdlib interpolations do not override before_write, which returns the value unchanged
+        before_write: Callable[..., str] | None = self._interpolation.before_write
+        if type(self._interpolation).before_write is configparser.Interpolation.before_write:
+            before_write = None
+        allow_no_value = self._allow_no_value
 
-        fp.write("[{}]\n".format(section_name))
+        fp.write(f"[{section_name}]\n")
         for key, value in section_items:
-            value = self._interpolation.before_write(self, section_name, key, value)
-            if value is not None or not self._allow_no_value:
+            if before_write is not None:
+                value = before_write(self, section_name, key, value)
+            if value is not None or not allow_no_value:
                 value = delimiter + str(value).replace("\n", "\n\t")
             else:
                 value = ""
 
-            comment = self._option_comments.get(section_name, {}).get(key, "")
+            comment = option_comments.get(key)
             if comment:
-                fp.write("{}\n".format(ConfigMatcher.add_prefix(comment, self._comment_prefixes[0])))
-            fp.write("{}{}\n".format(key, value))
+                fp.write(add_prefix(comment, prefix, guard=False) + "\n")
+            fp.write(f"{key}{value}\n")
         fp.write("\n")
 
     def _parse_comments(self, text: str | Iterable[str]) -> None:
         """Internal function to parse comments from the content string of a file."""
 
-        matcher = ConfigMatcher(self._delimiters, self._comment_prefixes)
-        matches = list(matcher.get_matches(text))
-        # print("Matches:", len(matches))
-        for m in matches:
-            # print("Match:", m.comment, m.section, m.option)
+        for m in self._matcher.get_matches(text):
             if m.section is None and m.option is None:
                 if self.top_comment is None:
                     self.top_comment = m.comment
@@ -165,12 +227,13 @@ class ExtendedConfigParser(configparser.ConfigParser):
             else:
                 self.set_comment(m.section, m.option, m.comment)
 
-    def __str__(self) -> str:
-        from io import StringIO
+    def _invalidate(self) -> None:
+        """Drop the values cached for the current state of the parser, called whenever a value changes."""
+        self._interpolation_cache.clear()
+        self._generation += 1
 
-        s = StringIO()
-        self.write(s)
-        return s.getvalue()
+    def __str__(self) -> str:
+        return self._serialize()
 
     #############################################################################
     ### PUBLIC METHODS
@@ -193,7 +256,7 @@ class ExtendedConfigParser(configparser.ConfigParser):
         if option is None:
             return self._section_comments.get(section, None)
 
-        option = option.lower()
+        option = self.optionxform(option)
         return self._option_comments.get(section, {}).get(option, "")
 
     def set_comment(self, section: str | None, option: str | None = None, comment: str | None = None) -> None:
@@ -218,25 +281,66 @@ class ExtendedConfigParser(configparser.ConfigParser):
             self._section_comments[section] = comment
             return
 
-        option = option.lower()
+        option = self.optionxform(option)
         if section not in self._option_comments:
             self._option_comments[section] = {}
 
         self._option_comments[section][option] = comment
 
+    def get_raw(self, section: str, key: str, fallback: Any = None) -> str | None:
+        """Return the raw value of an option, given its already transformed key.
+
+        Same as `get(section, option, raw=True, fallback=fallback)` with `key == optionxform(option)`,
+        but without the transformation of the option and the merging of the section with the defaults.
+
+        Parameters
+        ----------
+        section : str
+            Section name
+        key : str
+            Option name as returned by optionxform
+        fallback : Any, optional
+            Value returned if the section or option does not exist, by default None
+
+        Returns
+        -------
+        str | None
+            The raw value of the option.
+        """
+        options = self._sections.get(section)
+        if options is None:
+            if section != self.default_section:
+                return fallback
+        elif key in options:
+            return options[key]
+
+        return self._defaults.get(key, fallback)
+
     def set(
         self, section: str, option: str, value: str | None, comment: str | None = None, add_section_if_missing=True
     ):
         """Set an option in a section.
         Optionally set a comment for the option.
         """
-        if not self.has_section(section) and add_section_if_missing:
+        # Direct lookup instead of has_section, as this runs for every single value set
+        if add_section_if_missing and section not in self._sections:
             self.add_section(section)
 
+        self._invalidate()
         super().set(section, option, value)
         if comment:
             self.set_comment(section, option, comment)
 
+    def remove_option(self, section: str, option: str) -> bool:
+        """Remove an option from a section."""
+        self._invalidate()
+        return super().remove_option(section, option)
+
+    def remove_section(self, section: str) -> bool:
+        """Remove a section from the configuration."""
+        self._invalidate()
+        return super().remove_section(section)
+
     def add_section(self, section: str, comment: str | None = None):
         """Add a section to the configuration.
         Optionally set a comment for the section.
@@ -326,7 +430,6 @@ class ExtendedConfigParser(configparser.ConfigParser):
         a_path = os.path.abspath(n_path)
 
         if create_dir:
-            if not os.path.exists(a_path):
-                os.makedirs(a_path, exist_ok=True)
+            os.makedirs(a_path, exist_ok=True)
 
         return a_path
@@ -1,79 +1,121 @@
 from __future__ import annotations
 
+from typing import Final
+
 import pytest
 
+from extended_configparser.matcher import CommentMatch
 from extended_configparser.parser import ConfigMatcher
+from extended_configparser.parser import ExtendedConfigParser
 
 DELIMITER = ["=", ":"]
 COMMENT_PREFIXES = ["#", ";"]
 
 
-@pytest.mark.parametrize(
-    "line,expected",
-    [
-        ("# This is a comment", True),
-        ("; This is a = comment", True),
-        ("  \t; This is a: comment", True),
-        ("  \t# This is [a.comment]", True),
-        ("This not", False),
-        ("  \tThis.not", False),
-        ("[This.not]", False),
-        ("  \t[This.not]", False),
-        ("this = not", False),
-        ("this:not", False),
-        ("", False),
-        ("  \t", False),
-    ],
+# Each line with the expected results of is_comment, get_section and get_option
+_LINE_CASES: Final[tuple[tuple[str, bool, str | None, str | None], ...]] = (
+    ("# This is a comment", True, None, None),
+    ("; This is a = comment", True, None, None),
+    ("  \t; This is a: comment", True, None, None),
+    ("  \t# This is [a.comment]", True, None, None),
+    ("This not", False, None, None),
+    ("  \tThis.not", False, None, None),
+    ("[This.not]", False, "This.not", None),
+    ("  \t[This.not]", False, "This.not", None),
+    ("this = is", False, None, "this"),
+    ("  \tthis = is", False, None, "this"),
+    ("this:not", False, None, "this"),
+    ("  \tthis:not", False, None, "this"),
+    ("", False, None, None),
+    ("  \t", False, None, None),
 )
-def test_is_comment(line, expected):
-    matcher = ConfigMatcher(delimiters=DELIMITER, comment_prefixes=COMMENT_PREFIXES)
-    result = matcher.is_comment(line)
-    assert result is expected
 
+# Both orders of overlapping comment prefixes
+_OVERLAPPING_PREFIXES: Final[tuple[list[str], ...]] = (["#", "##"], ["##", "#"])
 
-@pytest.mark.parametrize(
-    ("line", "section"),
-    (
-        ("# This is a comment", None),
-        ("; This is a = comment", None),
-        ("  \t; This is a: comment", None),
-        ("  \t# This is [a.comment]", None),
-        ("This not", None),
-        ("  \tThis.not", None),
-        ("[This.not]", "This.not"),
-        ("  \t[This.not]", "This.not"),
-        ("this = not", None),
-        ("this:not", None),
-        ("", None),
-        ("  \t", None),
-    ),
-)
-def test_section(line, section):
-    matcher = ConfigMatcher(delimiters=DELIMITER, comment_prefixes=COMMENT_PREFIXES)
-    result = matcher.get_section(line)
-    assert result == section
+
+@pytest.fixture(scope="module")
+def matcher():
+    return ConfigMatcher.get(DELIMITER, COMMENT_PREFIXES)
+
+
+@pytest.mark.parametrize(("line", "is_comment", "section", "option"), _LINE_CASES)
+def test_line(line, is_comment, section, option, matcher):
+    assert matcher.is_comment(line) is is_comment
+    assert matcher.get_section(line) == section
+    assert matcher.get_option(line) == option
+
+    # classify decides the same on a single strip of the line
+    kind, value = matcher.classify(line)
+    if is_comment:
+        assert (kind, value) == ("comment", line.strip())
+    elif section is not None:
+        assert (kind, value) == ("section", section)
+    elif option is not None:
+        assert (kind, value) == ("option", option)
+    else:
+        assert (kind, value) == ("empty" if not line.strip() else None, None)
+
+
+def test_get_matches(matcher):
+    text = "# Top\n\n; Section\n[Section]\n# Option = comment\noption: value\ncontinued\n\n# End"
+
+    matches = [(m.comment, m.section, m.option) for m in matcher.get_matches(text)]
+    assert matches == [
+        ("Top", None, None),
+        ("Section", "Section", None),
+        ("Option = comment", "Section", "option"),
+        ("End", None, None),
+    ]
+
+
+@pytest.mark.parametrize("comment_prefixes", (COMMENT_PREFIXES, tuple(COMMENT_PREFIXES)))
+def test_clean_prefix(comment_prefixes):
+    assert ConfigMatcher.clean_prefix("# First\n;; Second", comment_prefixes) == "First\nSecond"
+    assert ConfigMatcher.clean_prefix("# Single", comment_prefixes, multiline=False) == " Single"
 
 
 @pytest.mark.parametrize(
-    ("line", "option"),
+    ("text", "expected"),
     (
-        ("# This is a comment", None),
-        ("; This is a = comment", None),
-        ("  \t; This is a: comment", None),
-        ("  \t# This is [a.comment]", None),
-        ("This not", None),
-        ("  \tThis.not", None),
-        ("[This.not]", None),
-        ("  \t[This.not]", None),
-        ("this = is", "this"),
-        ("  \tthis = is", "this"),
-        ("this:not", "this"),
-        ("  \tthis:not", "this"),
-        ("", None),
-        ("  \t", None),
+        ("[s]\na = 1\n# trailing\n", []),
+        ("[s]\na = 1\n# trailing", [("trailing", None, None)]),
+        ("[Section]\r\noption = value\r\n# End\r\n", []),
+        ("# Top\rstill top\n\n[s]\n", [("Top\rstill top", None, None)]),
+        ("", []),
     ),
 )
-def test_option(line, option):
-    matcher = ConfigMatcher(delimiters=DELIMITER, comment_prefixes=COMMENT_PREFIXES)
-    result = matcher.get_option(line)
-    assert result == option
+def test_get_matches_string_like_split(text, expected, matcher):
+    # Strings are split into lines like text.split("\n"), only at "\n" and with a final empty line
+    from_string = [(m.comment, m.section, m.option) for m in matcher.get_matches(text)]
+    from_split = [(m.comment, m.section, m.option) for m in matcher.get_matches(text.split("\n"))]
+    assert from_string == from_split == expected
+
+
+def test_comment_match_removes_prefixes(matcher):
+    match = CommentMatch(matcher, "# First\n;Second\nThird", "Section", None)
+
+    assert match.comment == "First\nSecond\nThird"
+
+
+@pytest.mark.parametrize("comment_prefixes", _OVERLAPPING_PREFIXES)
+def test_comment_match_overlapping_prefixes(comment_prefixes):
+    matcher = ConfigMatcher(delimiters=DELIMITER, comment_prefixes=comment_prefixes)
+    match = CommentMatch(matcher, "## First\n# Second", None, None)
+
+    assert match.comment == "First\nSecond"
+
+
+def test_get_shared_matcher(matcher):
+    assert ConfigMatcher.get(tuple(DELIMITER), tuple(COMMENT_PREFIXES)) is matcher
+    assert ExtendedConfigParser()._matcher is matcher
+    assert ConfigMatcher.get(DELIMITER, ["#"]) is not matcher
+
+
+def test_option_with_whitespace_delimiter():
+    matcher = ConfigMatcher(delimiters=(":=", " = "), comment_prefixes=COMMENT_PREFIXES)
+
+    # The whitespace of the delimiter is part of the line, which is only matched by the pattern
+    assert matcher.get_option("a = ") == "a"
+    assert matcher.classify("a = ") == ("option", "a")
+    assert matcher.get_option("a:=b") == "a"
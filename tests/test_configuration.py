@@ -0,0 +1,312 @@
+from __future__ import annotations
+
+import locale
+import os
+import subprocess
+import sys
+
+from extended_configparser.configuration.configuration import Configuration
+from extended_configparser.configuration.entries.base import ConfigEntry
+from extended_configparser.configuration.entries.base import ConfigEntryCollection
+from extended_configparser.configuration.entries.section import ConfigSection
+
+
+class PathsCollection(ConfigEntryCollection):
+    def __init__(self):
+        section = ConfigSection("Dirs")
+        self.root = section.Option("root", "/tmp/root", "Root directory")
+        self.data = section.Option("data", "${Dirs:root}/data", "Data directory")
+
+
+class SimpleConfig(Configuration):
+    def __init__(self, path: str):
+        super().__init__(path)
+        self.paths = PathsCollection()
+        self.name = ConfigSection("General").Option("name", "foo", "Name")
+
+
+def test_entries(tmp_path):
+    config = SimpleConfig(str(tmp_path / "config.cfg"))
+
+    assert config.entries == (config.paths.root, config.paths.data, config.name)
+
+    other = SimpleConfig(str(tmp_path / "other.cfg"))
+    assert other.entries == (other.paths.root, other.paths.data, other.name)
+    assert all(a is not b for a, b in zip(config.entries, other.entries))
+
+
+class ConditionalConfig(Configuration):
+    def __init__(self, path: str, extra: bool, optional: bool = True):
+        super().__init__(path)
+        section = ConfigSection("General")
+        self.a = section.Option("a", "a", "A")
+        if extra:
+            self.b = section.Option("b", "b", "B")
+        self.z = section.Option("z", "z", "Z") if optional else None
+
+
+def test_entries_differ_between_instances(tmp_path):
+    # Instances of the same class can define different entries, each one is collected on its own
+    assert [e.option for e in ConditionalConfig(None, extra=False).entries] == ["a", "z"]
+
+    config = ConditionalConfig(str(tmp_path / "config.cfg"), extra=True)
+    assert [e.option for e in config.entries] == ["a", "b", "z"]
+    config.load(quiet=True)
+    config.b.value = "value"
+    assert config.b.value == "value"
+
+    config = ConditionalConfig(str(tmp_path / "config.cfg"), extra=False, optional=False)
+    assert [e.option for e in config.entries] == ["a"]
+    config.load(quiet=True)
+
+
+def test_load(tmp_path):
+    path = tmp_path / "config.cfg"
+    path.write_text("[General]\nname = bar\n")
+
+    config = SimpleConfig(str(path))
+    config.load()
+    assert config.name.configparser is config._config_parser
+    assert config.name.configuration is config
+    assert config.name.raw_value == "bar"
+
+    # Reloading refreshes the values of the already bound entries
+    path.write_text("[General]\nname = baz\n")
+    config.load()
+    assert config.name.raw_value == "baz"
+
+
+def test_write(tmp_path):
+    path = tmp_path / "sub" / "config.cfg"
+
+    config = SimpleConfig(str(path))
+    config.load(quiet=True)
+    config.paths.root.value = "/tmp/root"
+    config.paths.data.value = "${Dirs:root}/data"
+    config.name.value = "bar"
+    config.write()
+
+    assert path.read_text(encoding="utf-8").strip() == (
+        "[Dirs]\n"
+        "# Root directory\n"
+        "root = /tmp/root\n"
+        "# Data directory\n"
+        "data = ${Dirs:root}/data\n"
+        "\n"
+        "[General]\n"
+        "# Name\n"
+        "name = bar"
+    )
+
+
+def test_read(tmp_path):
+    path = tmp_path / "config.cfg"
+    path.write_text("[General]\n# Name\nname = bar\n", encoding="utf-8")
+
+    config = SimpleConfig(None)
+    assert config.read([str(path), str(tmp_path / "missing.cfg")]) == [str(path)]
+    assert config.name.raw_value == "bar"
+    assert config._config_parser.get_comment("General", "name") == "Name"
+
+
+def test_read_like_configparser(tmp_path):
+    path = tmp_path / "config.cfg"
+    path.write_bytes("[General]\nname = b\xe4r\n".encode("latin-1"))
+
+    # Like ConfigParser.read, paths are returned as given by os.fspath and the encoding can be chosen
+    config = SimpleConfig(None)
+    assert config.read(path, encoding="latin-1") == [str(path)]
+    assert config.name.raw_value == "b\xe4r"
+    assert config.read(os.fsencode(path), encoding="latin-1") == [os.fsencode(path)]
+
+
+def test_write_keeps_foreign_content(tmp_path):
+    path = tmp_path / "config.cfg"
+    path.write_text("[Other]\nkey = value\n", encoding="utf-8")
+
+    config = SimpleConfig(str(path))
+    config.load()
+    config.paths.root.value = "/tmp/root"
+    config.paths.data.value = "/tmp/data"
+    config.name.value = "bar"
+    config.write()
+
+    config.name.value = "baz"
+    config.write()
+
+    content = path.read_text(encoding="utf-8")
+    assert "[Other]\nkey = value\n" in content
+    assert "name = baz" in content
+
+
+def test_write_keeps_content_added_between_writes(tmp_path):
+    path = tmp_path / "config.cfg"
+
+    config = SimpleConfig(str(path))
+    config.load(quiet=True)
+    config.name.value = "bar"
+    config.write()
+
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("\n[Other]\nkey = value\n")
+
+    config.name.value = "baz"
+    config.write()
+
+    content = path.read_text(encoding="utf-8")
+    assert "[Other]\nkey = value\n" in content
+    assert "name = baz" in content
+
+
+def test_write_uses_locale_encoding(tmp_path, monkeypatch):
+    monkeypatch.setattr(locale, "getpreferredencoding", lambda do_setlocale=True: "cp1252")
+    path = tmp_path / "config.cfg"
+
+    config = SimpleConfig(str(path))
+    config.load(quiet=True)
+    config.name.value = "M\xfcller"
+    config.write()
+    assert b"name = M\xfcller" in path.read_bytes()
+
+    # Files are written with the same encoding as they are read
+    config = SimpleConfig(str(path))
+    config.load()
+    assert config.name.value == "M\xfcller"
+
+    # Existing content written by others is decoded with the same encoding before merging
+    path.write_bytes("[Other]\nkey = gr\xfc\xdf\n[General]\nname = M\xfcller\n".encode("cp1252"))
+    config.load()
+    config.paths.root.value = "/tmp/root"
+    config.write()
+    content = path.read_bytes().decode("cp1252")
+    assert "key = gr\xfc\xdf" in content
+    assert "name = M\xfcller" in content
+
+
+class SlottedConfig(Configuration):
+    __slots__ = ("name",)
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        self.name = ConfigSection("General").Option("name", "foo", "Name")
+
+
+def test_slotted_entries(tmp_path):
+    config = SlottedConfig(str(tmp_path / "config.cfg"))
+    assert not hasattr(config, "__dict__")
+    assert config.entries == (config.name,)
+
+
+def test_write_skips_unset_entries(tmp_path):
+    path = tmp_path / "config.cfg"
+
+    config = SimpleConfig(str(path))
+    config.load(quiet=True)
+    config.name.value = "bar"
+    config.write()
+
+    # Sections without any set entry are not written
+    assert path.read_text(encoding="utf-8").strip() == "[General]\n# Name\nname = bar"
+
+
+def test_inquirer_is_imported_lazily():
+    # Only reading configurations must not pay for importing the prompt library
+    code = "import sys, extended_configparser.configuration; assert 'InquirerPy' not in sys.modules"
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_load_many_base_paths(tmp_path):
+    base_paths = []
+    for i in range(4):
+        base_path = tmp_path / f"base{i}.cfg"
+        base_path.write_text(f"[General]\nname = base{i}\n", encoding="utf-8")
+        base_paths.append(str(base_path))
+    base_paths.insert(2, str(tmp_path / "missing.cfg"))
+
+    config = SimpleConfig(None)
+    config.base_paths = base_paths
+    config.load(quiet=True)
+
+    # Files are parsed in the given order, so the last base path wins
+    assert config.name.raw_value == "base3"
+
+
+def test_load_few_base_paths_serially(tmp_path, mocker):
+    base_paths = []
+    for i in range(2):
+        base_path = tmp_path / f"base{i}.cfg"
+        base_path.write_text(f"[General]\nname = base{i}\n", encoding="utf-8")
+        base_paths.append(str(base_path))
+    (tmp_path / "config.cfg").write_text("[General]\nname = own\n", encoding="utf-8")
+
+    # Two base files next to the own config file stay below the threshold for concurrent reads
+    executor = mocker.patch("extended_configparser.configuration.configuration.ThreadPoolExecutor")
+    config = SimpleConfig(str(tmp_path / "config.cfg"))
+    config.base_paths = base_paths
+    config.load()
+
+    executor.assert_not_called()
+    assert config.name.raw_value == "own"
+
+
+def test_batched_writes(tmp_path, mocker):
+    config = SimpleConfig(str(tmp_path / "config.cfg"))
+    config.auto_save = True
+    config.load(quiet=True)
+    write = mocker.spy(config, "write")
+
+    with config.batched_writes():
+        config.paths.root.value = "/tmp/root"
+        config.paths.data.value = "/tmp/data"
+        config.name.value = "bar"
+        assert write.call_count == 0
+
+    assert write.call_count == 1
+    assert "name = bar" in (tmp_path / "config.cfg").read_text(encoding="utf-8")
+
+
+def test_inquire_writes_once(tmp_path, mocker):
+    config = SimpleConfig(str(tmp_path / "config.cfg"))
+    config.auto_save = True
+    write = mocker.spy(config, "write")
+
+    def inquire(entry, use_existing_as_default=True):
+        entry.value = entry.default
+
+    mocker.patch.object(ConfigEntry, "inquire", inquire)
+    config.inquire()
+
+    assert write.call_count == 1
+    assert "name = foo" in (tmp_path / "config.cfg").read_text(encoding="utf-8")
+
+
+def test_cached_value(tmp_path):
+    config = SimpleConfig(str(tmp_path / "config.cfg"))
+    config.load(quiet=True)
+    config.paths.root.value = "/tmp/root"
+    config.paths.data.value = "${Dirs:root}/data"
+
+    assert config.paths.data.value == "/tmp/root/data"
+    assert config.paths.data.value is config.paths.data.value
+
+    # Changing a referenced entry invalidates the cached values of all entries
+    config.paths.root.value = "/tmp/other"
+    assert config.paths.data.value == "/tmp/other/data"
+
+    (tmp_path / "config.cfg").write_text("[Dirs]\nroot = /tmp/read\ndata = ${Dirs:root}/data\n", encoding="utf-8")
+    config.load()
+    assert config.paths.data.value == "/tmp/read/data"
+
+
+def test_write_repairs_changed_content(tmp_path):
+    path = tmp_path / "config.cfg"
+    config = SimpleConfig(str(path))
+    config.load(quiet=True)
+    config.name.value = "bar"
+    config.write()
+
+    # Every explicit write writes the file, also if it was changed by others without changing its size
+    content = path.read_text(encoding="utf-8")
+    path.write_text(content.replace("name = bar", "name = baz"), encoding="utf-8")
+    config.write()
+    assert path.read_text(encoding="utf-8") == content
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import pytest
+
+from extended_configparser.configuration.entries.base import ConfigEntry
+from extended_configparser.configuration.entries.confirmation import (
+    ConfigConfirmationEntry,
+)
+from extended_configparser.configuration.entries.selection import ConfigSelectionEntry
+from extended_configparser.interpolator import EnvInterpolation
+from extended_configparser.parser import ExtendedConfigParser
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    (
+        ("section", "section"),
+        ("My Section", "My_Section"),
+        ("  padded\toption ", "padded_option"),
+        ("path/sub", "path/sub"),
+        ("dirs/settings", "dirs/settings"),
+    ),
+)
+def test_escape_whitespace(value, expected):
+    assert ConfigEntry.escape_whitespace(value) == expected
+
+
+def test_get_value():
+    parser = ExtendedConfigParser(interpolation=EnvInterpolation())
+    parser.read_string("[Section]\nplain = value\nref = ${plain}/sub\nnumber = 3\n")
+
+    def entry(option: str, default: str | None = None, **kwargs) -> ConfigEntry:
+        e = ConfigEntry("Section", option, default, "Message", **kwargs)
+        e.configparser = parser
+        return e
+
+    assert entry("plain").value == "value"
+    assert entry("ref").value == "value/sub"
+    assert entry("number", value_getter=int).value == 3
+    assert entry("missing", "default").value == "default"
+    assert entry("missing").get_value(fallback="fallback") == "fallback"
+
+
+def test_get_dir_value(tmp_path):
+    parser = ExtendedConfigParser()
+    parser.read_string(f"[Section]\ndir = {tmp_path}/a/b/\nrelative = some/dir\n")
+
+    e = ConfigEntry("Section", "dir", None, "Message", is_dir=True)
+    e.configparser = parser
+    assert e.value == str(tmp_path / "a" / "b")
+    assert (tmp_path / "a" / "b").is_dir()
+
+    # Paths that are not explicitly relative or absolute are returned untouched
+    e = ConfigEntry("Section", "relative", None, "Message", is_dir=True)
+    e.configparser = parser
+    assert e.value == "some/dir"
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    (("Yes", True), (" true ", True), ("1", True), ("on", True), ("No", False), ("", False), (None, False), (2, True)),
+)
+def test_to_bool(value, expected):
+    assert ConfigConfirmationEntry.to_bool(value) is expected
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    ((None, []), ("", []), ("a", ["a"]), ("a, b", ["a", "b"]), (" a ,  b , c", ["a", "b", "c"])),
+)
+def test_string_to_list(value, expected):
+    assert ConfigSelectionEntry.string_to_list(value, ",") == expected
+
+
+def test_selection_inquire_condition(mocker):
+    entry = ConfigSelectionEntry("Section", "selection", ["a"], "Selection", inquire=False, choices=["a", "b"])
+    get_inquirer = mocker.patch("extended_configparser.configuration.entries.base.get_inquirer")
+
+    entry.inquire()
+    get_inquirer.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    ("values", "expected"),
+    ((None, None), ([], ""), (["a", "b"], "a, b"), ("a, b", "a, b")),
+)
+def test_list_to_string(values, expected):
+    assert ConfigSelectionEntry.list_to_string(values) == expected
+
+
+@pytest.mark.parametrize(
+    ("msg", "end", "expected"),
+    (("Name", ":", "Name:"), (" Name: ", ":", "Name:"), ("Name...", ":", "Name:"), ("Sure?", "?", "Sure?")),
+)
+def test_get_msg(msg, end, expected):
+    assert ConfigEntry.get_msg(msg, end=end) == expected
+
+
+def test_entry_slots():
+    entries = (
+        ConfigEntry("Section", "option", "value", "Option"),
+        ConfigConfirmationEntry("Section", "confirmation", True, "Confirmation"),
+        ConfigSelectionEntry("Section", "selection", ["a"], "Selection", choices=["a", "b"]),
+    )
+    assert not any(hasattr(entry, "__dict__") for entry in entries)
+
+
+def test_inquire_executes_built_prompt(mocker):
+    parser = ExtendedConfigParser()
+    entry = ConfigConfirmationEntry("Section", "confirmation", True, "Confirmation")
+    entry.configparser = parser
+
+    inquirer = mocker.Mock()
+    inquirer.confirm.return_value.execute.return_value = False
+    mocker.patch("extended_configparser.configuration.entries.base.get_inquirer", return_value=inquirer)
+
+    entry.inquire(use_existing_as_default=False)
+
+    inquirer.confirm.assert_called_once_with(message="Confirmation:", default=True, qmark="?", amark=">")
+    assert entry.value is False
+
+
+def test_value_without_configparser():
+    entry = ConfigEntry("Section", "option", "default", "Message")
+
+    with pytest.raises(ValueError, match="ConfigParser is not set"):
+        entry.value
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
-import os
+import configparser
+import io
+import pathlib
 
 import pytest
-from pytest import fixture
 
 from extended_configparser.interpolator import EnvInterpolation
 from extended_configparser.parser import ExtendedConfigParser
@@ -11,36 +12,81 @@ from extended_configparser.parser import ExtendedConfigParser
 DELIMITER = ["=", ":"]
 COMMENT_PREFIXES = ["#", ";"]
 
+DATA_DIR = pathlib.Path(__file__).parent / "data"
 
-def test_write(shared_datadir, tmp_path):
-    contents = (shared_datadir / "env_config.cfg").read_text()
+
+@pytest.fixture(scope="module")
+def env_config_text():
+    return (DATA_DIR / "env_config.cfg").read_text()
+
+
+def test_write(env_config_text):
+    contents = env_config_text
 
     parser = ExtendedConfigParser()
     parser.read_string(contents)
 
-    output_path = tmp_path / "output.cfg"
-    with open(output_path, "w") as f:
-        parser.write(f)
-
-    output_contents = output_path.read_text()
+    buf = io.StringIO()
+    parser.write(buf)
+    output_contents = buf.getvalue()
 
     assert contents.strip() == output_contents.strip()
 
 
-def test_interpolation(shared_datadir, tmp_path):
-    contents = (shared_datadir / "env_config.cfg").read_text()
+def test_interpolation(env_config_text, monkeypatch):
+    contents = env_config_text
 
-    os.environ["TEMP_ENV_VAR1"] = "EnvValue1"
-    os.environ["TEMP_ENV_VAR2"] = "EnvValue2"
+    monkeypatch.setenv("TEMP_ENV_VAR1", "EnvValue1")
+    monkeypatch.setenv("TEMP_ENV_VAR2", "EnvValue2")
 
     parser = ExtendedConfigParser(interpolation=EnvInterpolation())
     parser.read_string(contents)
 
-    assert parser.get("Section1", "a") == "a"
-    assert parser.get("Section1", "b") == "a"
-    assert parser.get("Section1", "c") == "EnvValue1/a"
-    assert parser.get("Section1", "d") == "EnvValue2"
-    assert parser.get("Section2", "a") == "a"
-    assert parser.get("Section2", "b") == "EnvValue2/a/EnvValue1"
+    # All values are resolved in one pass and compared at once
+    resolved = {
+        (section, option): parser.get(section, option)
+        for section in parser.sections()
+        for option in parser.options(section)
+    }
+    assert resolved == {
+        ("Section1", "a"): "a",
+        ("Section1", "b"): "a",
+        ("Section1", "c"): "EnvValue1/a",
+        ("Section1", "d"): "EnvValue2",
+        ("Section2", "a"): "a",
+        ("Section2", "b"): "EnvValue2/a/EnvValue1",
+    }
 
     assert parser.get("Section2", "b", raw=True) == r"$TEMP_ENV_VAR2/${Section1:b}/${TEMP_ENV_VAR1}"
+
+
+def test_uninterpolated_values():
+    parser = ExtendedConfigParser(interpolation=EnvInterpolation(allow_uninterpolated_values=True))
+    parser.read_string("[Section1]\na = a\nb = ${Section1:a}/${Missing:a}\n")
+
+    assert parser.get("Section1", "b") == "a/${Missing:a}"
+
+
+def test_interpolation_cache():
+    parser = ExtendedConfigParser(interpolation=EnvInterpolation())
+    parser.read_string("[Section1]\na = a\nb = ${a}/b\n")
+
+    assert parser.get("Section1", "b") == "a/b"
+    assert parser._interpolation_cache == {("Section1", "b", "${a}/b"): "a/b"}
+
+    # Values given as vars must bypass the cache
+    assert parser.get("Section1", "b", vars={"a": "x"}) == "x/b"
+
+    # Changing a referenced value invalidates the cached results
+    parser.set("Section1", "a", "c")
+    assert parser.get("Section1", "b") == "c/b"
+    parser.remove_option("Section1", "a")
+    with pytest.raises(configparser.InterpolationMissingOptionError):
+        parser.get("Section1", "b")
+
+
+def test_nested_interpolation_with_defaults():
+    parser = ExtendedConfigParser(interpolation=EnvInterpolation())
+    parser.read_string("[DEFAULT]\nroot = /r\n[Section1]\na = ${root}/a\n[Section2]\nb = ${Section1:a}/b\n")
+
+    assert parser.get("Section2", "b") == "/r/a/b"
@@ -1,10 +1,7 @@
 from __future__ import annotations
 
-import io
 import pathlib
 
-import pytest
-
 from extended_configparser.configuration.configuration import Configuration
 from extended_configparser.configuration.entries.base import ConfigEntry
 from extended_configparser.configuration.entries.base import ConfigEntryCollection
@@ -49,9 +46,9 @@ class MainConfig(Configuration):
 
 
 # TODO: Automate the input for testing. Currently it is manual.
-def inquire(shared_datadir):
+def inquire(data_dir):
 
-    config = MainConfig(shared_datadir / "test_config.cfg")
+    config = MainConfig(data_dir / "test_config.cfg")
 
     # mocker.patch("builtins.input", side_effect=["/tmp/test", "/tmp/test/subdir", "TestValue"])
     # mocker.patch("sys.stdin", side_effect=["/tmp/test", "/tmp/test/subdir", "TestValue"])
@@ -59,7 +56,7 @@ def inquire(shared_datadir):
     config.inquire()
     config.write()
 
-    content = (shared_datadir / "test_config.cfg").read_text()
+    content = (data_dir / "test_config.cfg").read_text()
     print(content)
     s = """[Dirs]
 # Root directory for all data
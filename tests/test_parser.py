@@ -1,22 +1,58 @@
 from __future__ import annotations
 
+import io
+import itertools
+import pathlib
+
 import pytest
-from pytest import fixture
 
 from extended_configparser.parser import ExtendedConfigParser
 
 DELIMITER = ["=", ":"]
 COMMENT_PREFIXES = ["#", ";"]
 
+DATA_DIR = pathlib.Path(__file__).parent / "data"
+
+
+# The data files are only read, so they are read once per module instead of copied and read for every test
+@pytest.fixture(scope="module")
+def config1_text():
+    return (DATA_DIR / "config1.cfg").read_text()
+
+
+@pytest.fixture(scope="module")
+def config1_result_text():
+    return (DATA_DIR / "config1_result.cfg").read_text()
+
+
+@pytest.fixture(scope="module")
+def config2_result_text():
+    return (DATA_DIR / "config2_result.cfg").read_text()
+
+
+def nonempty_lines(text):
+    return (stripped for stripped in map(str.strip, text.splitlines()) if stripped)
+
+
+def assert_same_lines(output, expected):
+    """Compare the non-empty lines of two texts, ignoring surrounding whitespace."""
+    # zip_longest instead of zip(..., strict=True), which requires Python 3.10
+    for output_line, expected_line in itertools.zip_longest(nonempty_lines(output), nonempty_lines(expected)):
+        assert output_line == expected_line
 
-def test_read(shared_datadir):
-    contents = (shared_datadir / "config1.cfg").read_text()
 
+@pytest.fixture(scope="module")
+def config1_parser(config1_text):
+    """Parser of config1.cfg shared by the tests that do not change it."""
     parser = ExtendedConfigParser()
-    print(contents)
-    parser.read_string(contents)
+    parser.read_string(config1_text)
+    return parser
+
+
+def test_read(config1_parser):
+    parser = config1_parser
 
-    assert len(parser.sections()) == 1
+    assert len(parser._sections) == 1
 
     top_comment = "Top Comment 1\nTop Comment 2"
     assert parser.top_comment == top_comment
@@ -33,76 +69,94 @@ def test_read(shared_datadir):
     assert parser.get_comment("Section.A", "Option2") == option2_comment
 
 
-def test_write(shared_datadir, tmp_path):
-    contents = (shared_datadir / "config1.cfg").read_text()
-    result = (shared_datadir / "config1_result.cfg").read_text()
+def test_write(config1_parser, config1_result_text):
+    parser = config1_parser
+    result = config1_result_text
 
-    parser = ExtendedConfigParser()
-    parser.read_string(contents)
+    buf = io.StringIO()
+    parser.write(buf)
+    output_contents = buf.getvalue()
 
-    output_path = tmp_path / "output.cfg"
-    with open(output_path, "w") as f:
-        parser.write(f)
+    assert_same_lines(output_contents, result)
 
-    output_contents = output_path.read_text()
 
-    output_lines = output_contents.split("\n")
-    result_lines = result.split("\n")
+def test_str(config1_parser):
+    parser = config1_parser
 
-    output_lines = [line.strip() for line in output_lines if len(line.strip()) > 0]
-    result_lines = [line.strip() for line in result_lines if len(line.strip()) > 0]
+    buf = io.StringIO()
+    parser.write(buf)
+    output_contents = buf.getvalue()
+    output_str = str(parser)
 
-    assert len(output_lines) == len(result_lines)
-    for output_line, result_line in zip(output_lines, result_lines):
-        assert output_line.strip() == result_line.strip()
+    assert output_contents.strip() == output_str.strip()
 
 
-def test_str(shared_datadir, tmp_path):
-    contents = (shared_datadir / "config1.cfg").read_text()
-    result = (shared_datadir / "config1_result.cfg").read_text()
+def test_change_comment(config1_text, config2_result_text):
+    result = config2_result_text
 
     parser = ExtendedConfigParser()
-    parser.read_string(contents)
+    parser.read_string(config1_text)
 
-    output_path = tmp_path / "output.cfg"
-    with open(output_path, "w") as f:
-        parser.write(f)
+    parser.add_section("Section.New", "New Section")
+    parser.set("Section.New", "new_option", "new_value", "New value with new comment")
 
-    output_contents = output_path.read_text()
-    output_str = str(parser)
+    parser.set_comment("Section.A", comment="New Section Comment")
+    parser.set_comment("Section.A", "option2", comment="New option2 comment")
 
-    assert output_contents.strip() == output_str.strip()
+    buf = io.StringIO()
+    parser.write(buf)
+    output_contents = buf.getvalue()
 
+    assert_same_lines(output_contents, result)
 
-def test_change_comment(shared_datadir, tmp_path):
-    contents = (shared_datadir / "config1.cfg").read_text()
-    result = (shared_datadir / "config2_result.cfg").read_text()
 
+def test_get_raw():
     parser = ExtendedConfigParser()
-    parser.read_string(contents)
+    parser.read_string("[DEFAULT]\nshared = ${a}\n\n[Section]\na = value\nOther = x\n")
 
-    parser.add_section("Section.New", "New Section")
-    parser.set("Section.New", "new_option", "new_value", "New value with new comment")
+    for section, option in (("Section", "a"), ("Section", "shared"), ("DEFAULT", "shared"), ("Section", "Other")):
+        key = parser.optionxform(option)
+        assert parser.get_raw(section, key) == parser.get(section, option, raw=True)
+
+    assert parser.get_raw("Section", "missing") is None
+    assert parser.get_raw("Missing", "a", fallback="fallback") == "fallback"
 
-    parser.set_comment("Section.A", comment="New Section Comment")
-    parser.set_comment("Section.A", "option2", comment="New option2 comment")
 
-    output_path = tmp_path / "output.cfg"
-    with open(output_path, "w") as f:
-        parser.write(f)
+def test_read_files():
+    parser = ExtendedConfigParser()
+    paths = [DATA_DIR / "config1.cfg", DATA_DIR / "missing.cfg"]
+
+    assert parser.read(paths) == [str(DATA_DIR / "config1.cfg")]
+    assert parser.get_comment("Section.A", "Option1") == "Single line comment"
+
+
+def test_read_lines_once(config1_text):
+    # Iterables of lines without seek can only be iterated once
+    parser = ExtendedConfigParser()
+    parser.read_file(iter(config1_text.splitlines(keepends=True)))
 
-    output_contents = output_path.read_text()
+    assert parser.get("Section.A", "option2") == "value2"
+    assert parser.get_comment("Section.A", "Option2") == "Multiline\ncomment"
 
-    output_lines = output_contents.split("\n")
-    result_lines = result.split("\n")
 
-    output_lines = [line.strip() for line in output_lines if len(line.strip()) > 0]
-    result_lines = [line.strip() for line in result_lines if len(line.strip()) > 0]
+def test_write_nested_comment_prefix():
+    contents = "# # Commented out\n\n[Section]\n# option = old\noption = value\n"
 
-    print(output_lines)
-    print(result_lines)
+    parser = ExtendedConfigParser()
+    parser.read_string(contents)
+    assert parser.top_comment == "# Commented out"
+
+    # Writing and reading again keeps the prefix that is part of the comment
+    reread = ExtendedConfigParser()
+    reread.read_string(str(parser))
+    assert reread.top_comment == "# Commented out"
+    assert reread.get_comment("Section", "option") == "option = old"
 
-    assert len(output_lines) == len(result_lines)
-    for output_line, result_line in zip(output_lines, result_lines):
 
-        assert output_line.strip() == result_line.strip()
+def test_comments_follow_optionxform():
+    parser = ExtendedConfigParser()
+    parser.optionxform = str
+    parser.read_string("[Section]\n# Comment\nCamelCase = value\n")
+
+    assert parser.get_comment("Section", "CamelCase") == "Comment"
+    assert "# Comment\nCamelCase = value" in str(parser)